@@ -10,88 +10,181 @@ the user can select parameters to fix and free parameters with a range and grid
 
 import streamlit as st
 import numpy as np
+import io
+import itertools
+import functools
+import operator
+import importlib.util
+from multiprocessing import cpu_count
+
+# pandas, pyarrow and the batch runner (model, scipy, stqdm) are imported only where
+# they are used, so plain reruns while editing the sidebar stay cheap
+
+# the arrow CSV parser is multi-threaded; fall back to pandas' C parser without pyarrow
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+# compact dtypes for the batch-results columns used in the analysis
+BATCH_DTYPES = {
+    "num_jurors": "int16",
+    "lambda_qre": "float32",
+    "x_mean": "float32",
+    "avg_qre_prob_X": "float32",
+    "avg_payoff_X": "float32",
+    "avg_payoff_Y": "float32",
+    "Majority": "category",
+    "payoff_type": "category",
+}
 
 # st.set_page_config(page_title="Batch Processor")
 
+def range_values(min_v, max_v, inc):
+    """
+    evenly spaced grid from min_v to max_v (inclusive) with step close to inc
+
+    np.linspace fixes the number of points up front, so float accumulation in
+    np.arange cannot add or drop the last grid point
+    """
+    n = max(1, int(round((max_v - min_v) / inc)) + 1)
+    return np.linspace(min_v, max_v, n)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_csv(file_bytes):
+    """
+    parse an uploaded batch-results CSV
+
+    keyed on the raw file bytes, so reruns with the same upload skip the parse
+
+    the dtype map is narrowed to the columns in the header first: older pandas
+    raises under the pyarrow engine for dtype keys missing from the file
+    """
+    import pandas as pd
+    header = pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns
+    dtype = {col: t for col, t in BATCH_DTYPES.items() if col in header}
+    return pd.read_csv(io.BytesIO(file_bytes), engine=CSV_ENGINE, dtype=dtype)
+
 st.title("Batch Simulation Processor")
 
 st.sidebar.header("Batch Configuration")
 
+# widgets live in a form so editing them does not rerun the page until a submit button is pressed
+cfg = st.sidebar.form("batch_cfg")
+
 # Sidebar controls specific to batch logic
-st.sidebar.markdown("Select ranges or fixed values:")
+cfg.markdown("Select ranges or fixed values:")
 
 # fixed/flexible sidebar
 
 # number of jurors (M)
-fixed_jurors = st.sidebar.checkbox(r"Fix number of jurors ($M$)", value=True)
+fixed_jurors = cfg.checkbox(r"Fix number of jurors ($M$)", value=True)
 
 if fixed_jurors:
-    juror_range = [st.sidebar.slider(r"Number of Jurors $M$", 3, 51, 9, step=1)]
+    juror_range = [cfg.slider(r"Number of Jurors $M$", 3, 51, 9, step=1)]
 else:
-    min_jurors = st.sidebar.number_input(r"Min jurors ($M$)", 3, 51, 3, step=1)
-    max_jurors = st.sidebar.number_input(r"Max jurors ($M$)", min_jurors, 51, 21, step=1)
-    step_jurors = st.sidebar.number_input(r"increment size for ($M$)", 1, 10, 2, step=1)
+    min_jurors = cfg.number_input(r"Min jurors ($M$)", 3, 51, 3, step=1)
+    max_jurors = cfg.number_input(r"Max jurors ($M$)", min_jurors, 51, 21, step=1)
+    step_jurors = cfg.number_input(r"increment size for ($M$)", 1, 10, 2, step=1)
     juror_range = list(range(min_jurors, max_jurors + 1, step_jurors))
 
 # base reward (p)
-fixed_p = st.sidebar.checkbox(r"Fix base reward ($p$)", value=True)
+fixed_p = cfg.checkbox(r"Fix base reward ($p$)", value=True)
 
 if fixed_p:
-    p_range = [st.sidebar.slider(r"Base reward ($p$)", 0.0, 5.0, 1.0, step=0.1)]
+    p_range = [cfg.slider(r"Base reward ($p$)", 0.0, 5.0, 1.0, step=0.1)]
 else:
-    min_p = st.sidebar.number_input(r"Min base reward ($p$)", 0.0, 5.0, 0.5, step=0.1)
-    max_p = st.sidebar.number_input(r"Max base reward ($p$)", 0.0, 5.0, 1.5, step=0.1)
-    step_p = st.sidebar.number_input(r"increment size for $p$", 0.01, 1.0, 0.1, step=0.01)
-    p_range = list(np.arange(min_p, max_p + step_p, step_p))
+    min_p = cfg.number_input(r"Min base reward ($p$)", 0.0, 5.0, 0.5, step=0.1)
+    max_p = cfg.number_input(r"Max base reward ($p$)", 0.0, 5.0, 1.5, step=0.1)
+    step_p = cfg.number_input(r"increment size for $p$", 0.01, 1.0, 0.1, step=0.01)
+    p_range = range_values(min_p, max_p, step_p)
 
 # deposit (d)
-fixed_d = st.sidebar.checkbox(r"Fix deposit ($d$)", value=True)
+fixed_d = cfg.checkbox(r"Fix deposit ($d$)", value=True)
 if fixed_d:
-    d_range = [st.sidebar.slider(r"Deposit ($d$)", 0.0, 5.0, 0.0, step=0.1)]
+    d_range = [cfg.slider(r"Deposit ($d$)", 0.0, 5.0, 0.0, step=0.1)]
 else:
-    min_d = st.sidebar.number_input(r"Min $d$", 0.0, 5.0, 0.0)
-    max_d = st.sidebar.number_input(r"Max $d$", 0.0, 5.0, 1.0)
-    step_d = st.sidebar.number_input(r"increment size for $d$", 0.01, 1.0, 0.1)
-    d_range = list(np.arange(min_d, max_d + step_d, step_d))
+    min_d = cfg.number_input(r"Min $d$", 0.0, 5.0, 0.0)
+    max_d = cfg.number_input(r"Max $d$", 0.0, 5.0, 1.0)
+    step_d = cfg.number_input(r"increment size for $d$", 0.01, 1.0, 0.1)
+    d_range = range_values(min_d, max_d, step_d)
 
 # Lambda (QRE)
-fixed_lambda = st.sidebar.checkbox(r"Fix $\lambda$ (QRE sensitivity)", value=True)
+fixed_lambda = cfg.checkbox(r"Fix $\lambda$ (QRE sensitivity)", value=True)
 if fixed_lambda:
-    lambda_range = [st.sidebar.slider(r"$\lambda$", 0.1, 5.0, 1.5, step=0.1)]
+    lambda_range = [cfg.slider(r"$\lambda$", 0.1, 5.0, 1.5, step=0.1)]
 else:
-    min_l = st.sidebar.number_input(r"Min $\lambda$", 0.1, 5.0, 1.0)
-    max_l = st.sidebar.number_input(r"Max $\lambda$", 0.1, 5.0, 2.0)
-    step_l = st.sidebar.number_input(r"increment size for $\lambda$", 0.01, 1.0, 0.1)
-    lambda_range = list(np.arange(min_l, max_l + step_l, step_l))
+    min_l = cfg.number_input(r"Min $\lambda$", 0.1, 5.0, 1.0)
+    max_l = cfg.number_input(r"Max $\lambda$", 0.1, 5.0, 2.0)
+    step_l = cfg.number_input(r"increment size for $\lambda$", 0.01, 1.0, 0.1)
+    lambda_range = range_values(min_l, max_l, step_l)
 
 # Noise
-fixed_noise = st.sidebar.checkbox("Fix noise", value=True)
+fixed_noise = cfg.checkbox("Fix noise", value=True)
 if fixed_noise:
-    noise_range = [st.sidebar.slider("Noise", 0.0, 1.0, 0.1, step=0.01)]
+    noise_range = [cfg.slider("Noise", 0.0, 1.0, 0.1, step=0.01)]
 else:
-    min_n = st.sidebar.number_input("Min noise", 0.0, 1.0, 0.1)
-    max_n = st.sidebar.number_input("Max noise", 0.0, 1.0, 0.3)
-    step_n = st.sidebar.number_input("increment size for noise", 0.001, 1.0, 0.01)
-    noise_range = list(np.arange(min_n, max_n + step_n, step_n))
+    min_n = cfg.number_input("Min noise", 0.0, 1.0, 0.1)
+    max_n = cfg.number_input("Max noise", 0.0, 1.0, 0.3)
+    step_n = cfg.number_input("increment size for noise", 0.001, 1.0, 0.01)
+    noise_range = range_values(min_n, max_n, step_n)
 
 # x_mean
-fixed_x = st.sidebar.checkbox(r"Fix $x$ (expected coherence)", value=True)
+fixed_x = cfg.checkbox(r"Fix $x$ (expected coherence)", value=True)
 if fixed_x:
-    x_range = [st.sidebar.slider(r"$x$", 0.0, 1.0, 0.5, step=0.01)]
+    x_range = [cfg.slider(r"$x$", 0.0, 1.0, 0.5, step=0.01)]
 else:
-    min_x = st.sidebar.number_input(r"Min $x$", 0.0, 1.0, 0.4)
-    max_x = st.sidebar.number_input(r"Max $x$", 0.0, 1.0, 0.6)
-    step_x = st.sidebar.number_input(r"increment size for $x$", 0.001, 1.0, 0.01)
-    x_range = list(np.arange(min_x, max_x + step_x, step_x))
-
-payoff_type = st.sidebar.selectbox("Payoff Type", ["Basic", "Redistributive", "Symbiotic"])
-
-num_simulations = st.sidebar.number_input("Simulations per combination", 10, 1000, 100, step=10)
-st.sidebar.warning("⚠️ Large grids with many free parameters and small increment sizes may take a long time.")
-
-if st.sidebar.button("Run Batch Simulation"):
-    st.write(" Running simulations... (This will be implemented)")
-    # Your batch simulation logic goes here
+    min_x = cfg.number_input(r"Min $x$", 0.0, 1.0, 0.4)
+    max_x = cfg.number_input(r"Max $x$", 0.0, 1.0, 0.6)
+    step_x = cfg.number_input(r"increment size for $x$", 0.001, 1.0, 0.01)
+    x_range = range_values(min_x, max_x, step_x)
+
+payoff_type = cfg.selectbox("Payoff Type", ["Basic", "Redistributive", "Symbiotic"])
+
+# p+epsilon attack
+attack_mode = cfg.checkbox(r"Enable p+$\varepsilon$ Attack", value=False)
+fixed_epsilon = cfg.checkbox(r"Fix $\varepsilon$ (bribe amount)", value=True)
+if not attack_mode:
+    epsilon_vals = [0.0]
+elif fixed_epsilon:
+    epsilon_vals = [cfg.slider(r"$\varepsilon$", 0.0, 5.0, 0.0, step=0.1)]
+else:
+    min_e = cfg.number_input(r"Min $\varepsilon$", 0.0, 5.0, 0.0)
+    max_e = cfg.number_input(r"Max $\varepsilon$", 0.0, 5.0, 1.0)
+    step_e = cfg.number_input(r"increment size for $\varepsilon$", 0.01, 1.0, 0.1)
+    epsilon_vals = range_values(min_e, max_e, step_e)
+
+num_simulations = cfg.number_input("Simulations per combination", 10, 1000, 100, step=10)
+cfg.warning("⚠️ Large grids with many free parameters and small increment sizes may take a long time.")
+
+# "Apply" only submits the form (e.g. to show the range inputs after un-ticking a "Fix" box);
+# "Run" submits it too, so the sweep always uses the values currently on screen
+cfg.form_submit_button("Apply configuration")
+run_clicked = cfg.form_submit_button("Run Batch Simulation")
+
+if run_clicked:
+    from batch_runner import run_batch_parallel
+
+    ranges = (juror_range, p_range, d_range, lambda_range, noise_range, x_range, epsilon_vals)
+    param_names = ("num_jurors", "p", "d", "lambda_qre", "noise", "x_mean", "epsilon")
+
+    # grid size without materialising the cartesian product
+    total_batches = functools.reduce(operator.mul, map(len, ranges))
+
+    # yield one parameter dict per grid point, on demand, so workers start immediately
+    def gen_params():
+        for combo in itertools.product(*ranges):
+            yield dict(zip(param_names, combo),
+                       payoff_type=payoff_type,
+                       attack=attack_mode,
+                       num_simulations=num_simulations)
+
+    # leave one core for streamlit; ~4 chunks per worker keeps workers busy with little IPC
+    processes = max(1, cpu_count() - 1)
+    chunksize = max(1, min(1000, total_batches // (processes * 4)))
+    output_file = "batch_results.csv"
+
+    st.info(f"Running {total_batches} parameter combinations on {processes} processes (chunksize {chunksize})...")
+    df_preview = run_batch_parallel(gen_params(), processes, total=total_batches, chunksize=chunksize, output_file=output_file)
+    st.success(f"Batch complete! Results saved to `{output_file}`.")
+    st.dataframe(df_preview)
 else:
     st.info("Set parameters and click 'Run Batch Simulation' to begin.")
 
@@ -100,7 +193,6 @@ st.markdown("### Upload CSV File to Analyze Results")
 uploaded_file = st.file_uploader("Upload a CSV file from batch results")
 
 if uploaded_file:
-    import pandas as pd
-    df = pd.read_csv(uploaded_file)
+    df = load_csv(uploaded_file.getvalue())
     st.success("CSV loaded successfully!")
     st.dataframe(df.head())
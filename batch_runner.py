@@ -1,10 +1,10 @@
 from model import OracleModel
 import pandas as pd
+import numpy as np
 import math
 from multiprocessing import Pool, cpu_count
 from stqdm import stqdm
 import csv
-import os
 
 def run_simulation(params):
 
@@ -23,13 +23,21 @@ def run_simulation(params):
     utility_Y = results.get("utility_Y_list", [None] * len(history_Y))
     qre_probs = results.get("qre_prob_X_list", [None] * len(history_X))
 
+    # Majority + Tie logic, vectorised over all rounds at once
+    votes_X = np.asarray(history_X)
+    votes_Y = np.asarray(history_Y)
+    ties = votes_X == votes_Y
+    majority = np.where(ties, "Tie", np.where(votes_X > votes_Y, "X", "Y")).tolist()
+    tie_flags = ties.astype(int).tolist()
+    attack_succeeded = (votes_Y > votes_X).astype(int).tolist()
+
     rounds = range(1, len(history_X) + 1)
     rows = []
 
     for i, r in enumerate(rounds):
         row = {
             "Round": r,
-            "Number of Jurors": params["num_jurors"],
+            "num_jurors": params["num_jurors"],
             "base reward (p)": params["p"],
             "deposit (d)": params["d"],
             "noise": params["noise"],
@@ -54,12 +62,11 @@ def run_simulation(params):
             "avg_qre_prob_X": results.get("avg_qre_prob_X", 0.0),
         }
 
-        # Majority + Tie logic
-        row["Majority"] = "Tie" if history_X[i] == history_Y[i] else ("X" if history_X[i] > history_Y[i] else "Y")
-        row["Tie"] = 1 if history_X[i] == history_Y[i] else 0
+        row["Majority"] = majority[i]
+        row["Tie"] = tie_flags[i]
 
         if params["attack"]:
-            row["AttackSucceeded"] = 1 if row["Majority"] == "Y" else 0
+            row["AttackSucceeded"] = attack_succeeded[i]
             if "history_X_no_attack" in results:
                 row["X_votes_no_attack"] = results["history_X_no_attack"][i]
                 row["Y_votes_no_attack"] = results["history_Y_no_attack"][i]
@@ -70,36 +77,31 @@ def run_simulation(params):
 
     return rows  # list of dicts (to be flattened later)
 
-def run_batch_over_params(param_list_chunk):
-    all_rows = []
-    for params in param_list_chunk:
-        all_rows.extend(run_simulation(params))
-    return all_rows
-
-def chunk_list(lst, n):
-    """Split list `lst` into chunks of size n"""
-    for i in range(0, len(lst), n):
-        yield lst[i:i + n]
-
-def run_batch_parallel(param_list, processes, output_file="batch_results.csv"):
-    chunksize = 750  # conservative size
-    param_chunks = list(chunk_list(param_list, chunksize))
-    total_chunks = len(param_chunks)
-
-    # Remove previous output if it exists
-    if os.path.exists(output_file):
-        os.remove(output_file)
-
-    header_written = False
-
-    with Pool(processes=processes) as pool:
-        results = pool.imap_unordered(run_batch_over_params, param_chunks)
-        for chunk in stqdm(results, total=total_chunks):
-            df_chunk = pd.DataFrame(chunk)
-            if not header_written:
-                df_chunk.to_csv(output_file, index=False, mode="w", quoting=csv.QUOTE_NONNUMERIC)
-                header_written = True
-            else:
-                df_chunk.to_csv(output_file, index=False, header=False, mode="a", quoting=csv.QUOTE_NONNUMERIC)
-
-    return pd.read_csv(output_file)
\ No newline at end of file
+def run_batch_parallel(param_iter, processes, total=None, chunksize=750, output_file="batch_results.csv", preview_rows=10):
+    """
+    Run every parameter combination in `param_iter` across a worker pool.
+
+    `param_iter` can be any iterable (e.g. a generator over the sweep grid), so the
+    grid is never materialised in memory; `total` is only used as a length hint
+    for the progress bar. Results are streamed to `output_file` as they arrive.
+
+    Returns the first `preview_rows` rows written, as a DataFrame.
+    """
+    writer = None
+    head = []
+
+    # rows are written as soon as each worker returns, so memory stays flat in the grid size
+    with open(output_file, "w", newline="") as f:
+        with Pool(processes=processes) as pool:
+            results = pool.imap_unordered(run_simulation, param_iter, chunksize=chunksize)
+            for rows in stqdm(results, total=total):
+                if not rows:
+                    continue
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()), quoting=csv.QUOTE_NONNUMERIC)
+                    writer.writeheader()
+                writer.writerows(rows)
+                if len(head) < preview_rows:
+                    head.extend(rows[:preview_rows - len(head)])
+
+    return pd.DataFrame(head)
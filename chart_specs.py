@@ -0,0 +1,73 @@
+"""
+Vega-Lite specs for the charts on the simulation page
+
+they are plain dicts built once when this module is first imported, so streamlit
+reruns only swap in new data; run.py passes the data via st.vega_lite_chart
+"""
+
+INDEX_LABEL = "Round"
+
+# votes per round for X and Y, with dots for ties
+# data: long format with columns Round, Vote Type (X_votes / Y_votes / Tie), Count
+VOTES_SPEC = {
+    "width": 800,
+    "height": 400,
+    "encoding": {
+        "x": {"field": INDEX_LABEL, "type": "quantitative", "title": INDEX_LABEL},
+        "y": {"field": "Count", "type": "quantitative", "title": "Number of Votes"},
+        "color": {
+            "field": "Vote Type", "type": "nominal", "title": "Vote Option",
+            "scale": {"domain": ["X_votes", "Y_votes", "Tie"],
+                      "range": ["steelblue", "red", "gold"]},
+            "legend": {"labelExpr": """{
+                'X_votes': 'Votes for X',
+                'Y_votes': 'Votes for Y',
+                'Tie': 'Tied Votes'
+            }[datum.label]"""},
+        },
+    },
+    "layer": [
+        {"transform": [{"filter": "datum['Vote Type'] != 'Tie'"}], "mark": "line"},
+        # Add dots for ties
+        {"transform": [{"filter": "datum['Vote Type'] == 'Tie'"}],
+         "mark": {"type": "point", "size": 80, "shape": "circle"}},
+    ],
+}
+
+_PAYOFF_COLOR = {
+    "field": "Vote Type", "type": "nominal",
+    "scale": {"domain": ["avg_payoff_X", "avg_payoff_Y", "Tie round"],
+              "range": ["steelblue", "red", "gold"]},
+    "legend": {"title": "Vote Option",
+               "labelExpr": """{'avg_payoff_X': 'Payoff for voting X',
+                          'avg_payoff_Y': 'Payoff for voting Y',
+                          'Tie round': 'Tie round'}[datum.label]"""},
+}
+
+# payoff lines for X and Y, with dashed vertical rules where tie == 1
+# data: long format with columns Round, Vote Type (avg_payoff_X / avg_payoff_Y / Tie round), Average Payoff
+PAYOFF_SPEC = {
+    "width": 800,
+    "height": 400,
+    "layer": [
+        # Base payoff lines
+        {
+            "transform": [{"filter": "datum['Vote Type'] != 'Tie round'"}],
+            "mark": "line",
+            "encoding": {
+                "x": {"field": INDEX_LABEL, "type": "quantitative", "title": INDEX_LABEL},
+                "y": {"field": "Average Payoff", "type": "quantitative", "title": "Payoff"},
+                "color": _PAYOFF_COLOR,
+            },
+        },
+        # Tie lines
+        {
+            "transform": [{"filter": "datum['Vote Type'] == 'Tie round'"}],
+            "mark": {"type": "rule", "strokeDash": [4, 4], "stroke": "gold", "strokeWidth": 2},
+            "encoding": {
+                "x": {"field": INDEX_LABEL, "type": "quantitative"},
+                "color": _PAYOFF_COLOR,
+            },
+        },
+    ],
+}
@@ -1,12 +1,21 @@
 import json
-from collections import Counter
 import pandas as pd
 import os
 
+# orjson parses large dispute files much faster; fall back to the stdlib if it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class DisputeParser:
     def __init__(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        if orjson is not None:
+            with open(filepath, 'rb') as f:
+                self.data = orjson.loads(f.read())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
         self.rounds = self.data.get("rounds", [])
         self.filepath = filepath
 
@@ -21,16 +30,19 @@ class DisputeParser:
         if not self.rounds:
             return None
         final_round = self.rounds[-1]
-        choices = [v["choice"] for v in final_round["votes"] if v.get("voted") and v.get("choice") in ("1", "2")]
-        count = Counter(choices)
-        total = count["1"] + count["2"]
+        # single pass tally of the two valid choices
+        count_1 = count_2 = 0
+        for v in final_round["votes"]:
+            if v.get("voted"):
+                choice = v.get("choice")
+                count_1 += choice == "1"
+                count_2 += choice == "2"
+        total = count_1 + count_2
         if total == 0:
             return None
 
-        majority = "1" if count["1"] > count["2"] else "2"
-        minority = "2" if majority == "1" else "1"
-        x_votes = count[majority]
-        y_votes = count[minority]
+        majority = "1" if count_1 > count_2 else "2"
+        x_votes, y_votes = (count_1, count_2) if majority == "1" else (count_2, count_1)
         x_pct = round(100 * x_votes / total, 2)
         y_pct = round(100 * y_votes / total, 2)
 
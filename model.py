@@ -246,6 +246,10 @@ class OracleModel:
             self.history_Y_no_attack = []
             attack_effect_percent = []
 
+        # every progress update is a message to the frontend: refresh every 100 rounds,
+        # but no more than ~50 times in total for long runs
+        update_every = max(100, num_simulations // 50)
+
         outcomes = {"X": 0, "Y": 0}
         votes_X_array = np.zeros(num_simulations, dtype=np.uint16)
         votes_Y_array = np.zeros(num_simulations, dtype=np.uint16)
@@ -298,9 +302,9 @@ class OracleModel:
             self.qre_vote_probs_all.append(self.qre_vote_probs)
 
             # Update progress UI if provided
-            if progress_bar and i % 100 == 0:
+            if progress_bar and i % update_every == 0:
                 progress_bar.progress((i + 1) / num_simulations)
-            if status_text and i % 100 == 0:
+            if status_text and i % update_every == 0:
                 status_text.text(f"Running simulation {i + 1} / {num_simulations}")
 
         # Store histories from the attacked run (original behavior)
@@ -232,16 +232,19 @@ BATCH_RESULTS_PATH = Path(__file__).parent / "batch_results.csv"
 batch_df = (
     pd.read_csv(
         BATCH_RESULTS_PATH,
-        usecols=["Number of Jurors", "lambda_qre", "x_mean"],
-        dtype={"Number of Jurors": "int32", "lambda_qre": "float32", "x_mean": "float32"},
+        # older results files name the juror column "Number of Jurors"
+        usecols=lambda col: col in ("num_jurors", "Number of Jurors", "lambda_qre", "x_mean"),
+        dtype={"lambda_qre": "float32", "x_mean": "float32"},
         engine="c",
         memory_map=True
     )
     .rename(columns={
+        "num_jurors": "n_jurors",
         "Number of Jurors": "n_jurors",
         "lambda_qre": "lambda",
         "x_mean": "x",
     })
+    .astype({"n_jurors": "int32"})
 )
 
 train_boot = []   # list of (n_j, m_j, lambda_true, x_true)
@@ -15,10 +15,13 @@ import streamlit as st
 st.set_page_config(page_title="Simulate")
 
 import streamlit as st
-import pandas as pd
-import altair as alt
+import numpy as np
+import threading
+from collections import OrderedDict, namedtuple
 
-from model import OracleModel
+# pandas and the model (which pulls in scipy) are imported further down, after the
+# title and sidebar have been sent, so a cold start paints the UI first
+from chart_specs import INDEX_LABEL, VOTES_SPEC, PAYOFF_SPEC
 from payoff_mechanisms import (compute_payoff_basic_attack, compute_payoff_basic_no_attack, 
                                compute_payoff_redistributive_attack, compute_payoff_redistributive_no_attack, 
                                compute_payoff_symbiotic_attack, compute_payoff_symbiotic_no_attack)
@@ -74,81 +77,194 @@ st.title("Schelling Oracle Simulation")
 
 # Sidebar controls for model parameters
 st.sidebar.header("Simulation Parameters")
-num_jurors = st.sidebar.slider("Number of Jurors", min_value=1, max_value=100, value=10, step=1,
-                               help="Specifies the number of jurors voting.")
-log_lambda = st.sidebar.slider(r"log$_{10}$ QRE Sensitivity ($\lambda$)",
-                               -3.0, # log10(0.001)
-                               0.5, # log10(10)
-                               value=0.0, 
-                               step=0.01,
-                               help=r"Higher $\lambda$ means jurors are more sensitive to payoff differences (closer to rational). Lower values add noise and irrationality.")
+# widgets live in a form so dragging a slider does not rerun the script until the form is submitted
+params_form = st.sidebar.form("sim_params")
+num_jurors = params_form.slider("Number of Jurors", min_value=1, max_value=100, value=10, step=1,
+                                help="Specifies the number of jurors voting.")
+log_lambda = params_form.slider(r"log$_{10}$ QRE Sensitivity ($\lambda$)",
+                                -3.0, # log10(0.001)
+                                0.5, # log10(10)
+                                value=0.0, 
+                                step=0.01,
+                                help=r"Higher $\lambda$ means jurors are more sensitive to payoff differences (closer to rational). Lower values add noise and irrationality.")
 lambda_qre = 10 ** log_lambda
-noise = st.sidebar.slider("Perception Noise (Payoff Uncertainty)", 0.0, 1.0, value=0.1, step=0.01,
-                          help=help_noise)
-deposit = st.sidebar.slider("Deposit ($d$)", 0.0, 100.0, value=99.49, step=0.1,
-                            help="Specifies the initial deposit paid by the juror ($d$ in payoff matrix).")
-base_reward_frac = st.sidebar.slider("Base Reward ($p$)", 0.0, 100.0, value=33.40, step=0.1,
-                                     help="Specifies the reward for voting with the majority ($p$ in payoff matrix).")
-x_mean = st.sidebar.slider("Expected Share of Votes for $X$ ($x$)", 0.0, 1.0, value=0.0, step=0.01,
-                                  help=help_x_mean)
-# x_guess_noise = st.sidebar.slider("Variance in expected share of votes for $X$ ($x$)", 0.0, 1.0, value=0.0, step=0.01, disabled=(payoff_mode == "Basic"), help=help_x_guess)
-payoff_mode = st.sidebar.selectbox("Payoff Mechanism", ["Basic", "Redistributive", "Symbiotic"],
-                                   help=help_payoff_mech)
-attack_mode = st.sidebar.checkbox(r"Enable p+$\varepsilon$ Attack", value=False,
-                                  help=help_attack)
-epsilon_bonus = st.sidebar.slider(r"Epsilon (Bribe amount $\varepsilon$)", 0.0, 5.0, value=0.0, step=0.1, disabled=(not attack_mode),
-                                  help=r"Specifies Bribe amount ($\varepsilon$ in payoff matrix).")
-num_rounds = st.sidebar.number_input("Number of Simulation Rounds", min_value=1, max_value=10000, value=100, step=1,
-                                     help="Specifies number of simulations to run.")
-
-# Initialize the Oracle model with selected parameters
-model = OracleModel(num_jurors=num_jurors,
-                    lambda_qre=lambda_qre,
-                    noise=noise,
-                    p=base_reward_frac,
-                    d=deposit,
-                    epsilon=epsilon_bonus,
-                    payoff_type=payoff_mode,
-                    attack=attack_mode,
-                    x_mean=x_mean,
-                    #x_guess_noise=x_guess_noise
-                    )
-
-progress_bar = st.progress(0)
-status_text = st.empty()
-
-# Run the simulation for the specified number of rounds
-results = model.run_simulations(int(num_rounds), progress_bar=progress_bar, status_text=status_text)
-
-progress_bar.empty()
-status_text.empty()
-
-# use model history for normal rounds
-history_X = results.get("history_X", [])
-history_Y = results.get("history_Y", [])
-avg_payoff_X = results.get("avg_payoff_X", [])
-avg_payoff_Y = results.get("avg_payoff_Y", [])
+noise = params_form.slider("Perception Noise (Payoff Uncertainty)", 0.0, 1.0, value=0.1, step=0.01,
+                           help=help_noise)
+deposit = params_form.slider("Deposit ($d$)", 0.0, 100.0, value=99.49, step=0.1,
+                             help="Specifies the initial deposit paid by the juror ($d$ in payoff matrix).")
+base_reward_frac = params_form.slider("Base Reward ($p$)", 0.0, 100.0, value=33.40, step=0.1,
+                                      help="Specifies the reward for voting with the majority ($p$ in payoff matrix).")
+x_mean = params_form.slider("Expected Share of Votes for $X$ ($x$)", 0.0, 1.0, value=0.0, step=0.01,
+                                   help=help_x_mean)
+# x_guess_noise = params_form.slider("Variance in expected share of votes for $X$ ($x$)", 0.0, 1.0, value=0.0, step=0.01, disabled=(payoff_mode == "Basic"), help=help_x_guess)
+payoff_mode = params_form.selectbox("Payoff Mechanism", ["Basic", "Redistributive", "Symbiotic"],
+                                    help=help_payoff_mech)
+attack_mode = params_form.checkbox(r"Enable p+$\varepsilon$ Attack", value=False,
+                                   help=help_attack)
+epsilon_bonus = params_form.slider(r"Epsilon (Bribe amount $\varepsilon$)", 0.0, 5.0, value=0.0, step=0.1,
+                                   help=r"Specifies Bribe amount ($\varepsilon$ in payoff matrix). Only used when the attack is enabled.")
+num_rounds = params_form.number_input("Number of Simulation Rounds", min_value=1, max_value=10000, value=100, step=1,
+                                      help="Specifies number of simulations to run.")
+
+# All inputs of one simulation run, built once from the sidebar values. Being a tuple
+# of scalars it is cheap to hash as a cache key and to compare between reruns.
+SimParams = namedtuple("SimParams", ["num_jurors", "lambda_qre", "noise", "deposit", "base_reward_frac",
+                                     "epsilon_bonus", "payoff_mode", "attack_mode", "x_mean", "num_rounds"])
+
+# Long simulations are downsampled before charting so the X/Y vote and payoff lines send
+# a bounded number of points regardless of num_rounds. The tie markers are not thinned:
+# every tie round is still marked, so their row count grows with the number of ties.
+MAX_CHART_POINTS = 2000
+
+def _lttb_indices(x, y, n_out):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+    The first and last points are always kept; from every bucket in between, the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket is chosen, which preserves the visual shape.
+    NaN points (gaps in the line) are never kept and do not enter the buckets.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) < len(y):
+        return valid[_lttb_indices(x[valid], y[valid], n_out)]
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)  # n_out - 2 buckets
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+def _chart_indices(results):
+    """
+    rows to plot for the vote and payoff lines: None (all rounds) for short runs,
+    otherwise the union of the LTTB points of each plotted series
+    """
+    history_X = np.asarray(results.get("history_X", []), dtype=np.float64)
+    history_Y = np.asarray(results.get("history_Y", []), dtype=np.float64)
+    if len(history_X) <= MAX_CHART_POINTS:
+        return None, None
+
+    rounds = np.arange(1, len(history_X) + 1)
+    # X + Y votes is constant per round, so the X series alone determines the shape
+    votes_idx = _lttb_indices(rounds, history_X, MAX_CHART_POINTS)
+    # payoffs are not plotted on tie rounds, so those are masked out as gaps
+    tie = history_X == history_Y
+    payoff_idx = np.unique(np.concatenate([
+        _lttb_indices(rounds, np.where(tie, np.nan, np.asarray(results[col], dtype=np.float64)), MAX_CHART_POINTS)
+        for col in ("avg_payoff_X", "avg_payoff_Y")]))
+    return votes_idx, payoff_idx
+
+# Stored results of recent runs and their chart rows, keyed on SimParams and shared by
+# all sessions, so a first load with the default parameters (or a run returning to an
+# earlier combination) reuses them and the LTTB pass runs once per run. This is a plain
+# LRU rather than st.cache_data, because the progress widgets are drawn while simulating
+# and st.cache_data would replay those calls on a cache hit.
+SIM_CACHE_SIZE = 32
+
+@st.cache_resource
+def _sim_cache():
+    # the lock guards the LRU against reruns of concurrent sessions
+    return OrderedDict(), threading.Lock()
+
+def _run_sim(params):
+    cache, lock = _sim_cache()
+    with lock:
+        if params in cache:
+            cache.move_to_end(params)
+            return cache[params]
+
+    from model import OracleModel
+
+    # progress widgets are only drawn when the simulation actually runs
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+
+    # Initialize the Oracle model with selected parameters
+    model = OracleModel(num_jurors=params.num_jurors,
+                        lambda_qre=params.lambda_qre,
+                        noise=params.noise,
+                        p=params.base_reward_frac,
+                        d=params.deposit,
+                        epsilon=params.epsilon_bonus,
+                        payoff_type=params.payoff_mode,
+                        attack=params.attack_mode,
+                        x_mean=params.x_mean,
+                        #x_guess_noise=x_guess_noise
+                        )
+    results = model.run_simulations(params.num_rounds, progress_bar=progress_bar, status_text=status_text)
+
+    progress_bar.empty()
+    status_text.empty()
+
+    entry = (results, _chart_indices(results))
+    with lock:
+        cache[params] = entry
+        cache.move_to_end(params)
+        while len(cache) > SIM_CACHE_SIZE:
+            cache.popitem(last=False)
+    return entry
+
+run_clicked = params_form.form_submit_button("Run Simulation",
+                                             help="Runs the simulation with the parameters above. Results are kept "
+                                                  "per parameter combination, so running again without changing "
+                                                  "any parameter shows the same sample.")
+
+sim_params = SimParams(num_jurors, lambda_qre, noise, deposit, base_reward_frac, epsilon_bonus, payoff_mode,
+                       attack_mode, x_mean, int(num_rounds))
+
+# only simulate on first load or when the form is submitted
+if run_clicked or "results" not in st.session_state:
+    # Run the simulation for the specified number of rounds
+    st.session_state["results"], st.session_state["chart_rows"] = _run_sim(sim_params)
+    st.session_state["sim_params"] = sim_params
+
+# everything below describes the last simulation that was run
+results = st.session_state["results"]
+votes_rows, payoff_rows = st.session_state["chart_rows"]
+(num_jurors, lambda_qre, noise, deposit, base_reward_frac, epsilon_bonus, payoff_mode, attack_mode,
+ x_mean, num_rounds) = st.session_state["sim_params"]
+
+# use model history for normal rounds (vote counts fit in int16, payoffs are float32 in the model)
+history_X = np.asarray(results.get("history_X", []), dtype=np.int16)
+history_Y = np.asarray(results.get("history_Y", []), dtype=np.int16)
+avg_payoff_X = np.asarray(results.get("avg_payoff_X", []), dtype=np.float32)
+avg_payoff_Y = np.asarray(results.get("avg_payoff_Y", []), dtype=np.float32)
+
+import pandas as pd
 
 # Prepare DataFrame for plotting and CSV download
-index_label = "Round"
 rounds_index = list(range(1, len(history_X) + 1))
 
 df_overlay = None
 rounds_index = list(range(1, len(history_X) + 1))
 
+# constant columns are given as scalars; pandas broadcasts them to every round
 data_dict = {
 
     # input paramters
     
-    "Round": rounds_index,
-    "Number of Jurors": [num_jurors] * len(history_X),
-    "base reward (p)": [results["p"]] * len(history_X),
-    "deposit (d)": [results["d"]] * len(history_X),
-    "noise": [results["noise"]] * len(history_X),
-    "lambda_qre": [results["lambda_qre"]] * len(history_X),
-    "x_mean": [results["x_mean"]] * len(history_X),
-    # "x_guess_noise": [results["x_guess_noise"]] * len(history_X) if "x_guess_noise" in results else [0.0] * len(history_X),
-    "payoff_type": [results["payoff_type"]] * len(history_X),
+    INDEX_LABEL: rounds_index,
+    "Number of Jurors": num_jurors,
+    "base reward (p)": results["p"],
+    "deposit (d)": results["d"],
+    "noise": results["noise"],
+    "lambda_qre": results["lambda_qre"],
+    "x_mean": results["x_mean"],
+    # "x_guess_noise": results["x_guess_noise"] if "x_guess_noise" in results else 0.0,
+    "payoff_type": results["payoff_type"],
     
     # output parameters
 
@@ -162,107 +278,114 @@ data_dict = {
 
     # standard deviations
 
-    "std_votes_X": [results["std_votes_X"]] * len(history_X),
-    "std_votes_Y": [results["std_votes_Y"]] * len(history_X),
-    "std_payoff_X": [results["std_payoff_X"]] * len(history_X),
-    "std_payoff_Y": [results["std_payoff_Y"]] * len(history_X),
-    "avg_qre_prob_X": [results["avg_qre_prob_X"]] * len(history_X),
+    "std_votes_X": results["std_votes_X"],
+    "std_votes_Y": results["std_votes_Y"],
+    "std_payoff_X": results["std_payoff_X"],
+    "std_payoff_Y": results["std_payoff_Y"],
+    "avg_qre_prob_X": results["avg_qre_prob_X"],
 
 }
 
 # if attack mode add epsilon value
 if attack_mode:
-    data_dict["epsilon"] = [results["epsilon"]] * len(history_X)
+    data_dict["epsilon"] = results["epsilon"]
 
 # add no-attack vote columns if attack mode
 if attack_mode and "history_X_no_attack" in results:
-    data_dict["X_votes_no_attack"] = results["history_X_no_attack"]
-    data_dict["Y_votes_no_attack"] = results["history_Y_no_attack"]
+    data_dict["X_votes_no_attack"] = np.asarray(results["history_X_no_attack"], dtype=np.int16)
+    data_dict["Y_votes_no_attack"] = np.asarray(results["history_Y_no_attack"], dtype=np.int16)
 
 df = pd.DataFrame(data_dict)
 
-# determine the majority and whether attack succeeded
-df["Majority"] = df.apply(
-    lambda row: "Tie" if row["X_votes"] == row["Y_votes"]
-    else ("X" if row["X_votes"] > row["Y_votes"] else "Y"),
-    axis=1
-)
-df["Tie"] = (df["X_votes"] == df["Y_votes"]).astype(int)
-if attack_mode:
-    df["AttackSucceeded"] = df["Majority"].apply(lambda m: 1 if m == "Y" else 0)
-else:
-    df["AttackSucceeded"] = 0
+# outcome of every round (vectorised); the Majority/AttackSucceeded labels are only
+# needed in the CSV, so they are added by _encode_csv
+tie_mask = history_X == history_Y
+y_wins = history_Y > history_X
+df["Tie"] = tie_mask.astype(int)
 
 # Payoff matrix visualisation
 st.subheader("Payoff Mechanism Matrix")
 
-# Prepare table content based on selected payoff type and attack mode
-if payoff_mode == "Basic":
-    st.markdown("#### Basic Mechanism" + (" with Attack" if attack_mode else ""))
-    data = {
-        "X wins": [
-            r"$p$",
-            r"$-d$" if not attack_mode else r"$p+\varepsilon$"],
-        "Y wins": [
-            r"$-d$",
-            r"$p$"
+# the symbolic matrix only depends on the mechanism and attack toggle, so it is built
+# once per combination as a single markdown blob (table + variable explanations)
+@st.cache_data(show_spinner=False)
+def _payoff_matrix_md(payoff_mode, attack_mode):
+    # Prepare table content based on selected payoff type and attack mode
+    if payoff_mode == "Basic":
+        title = "Basic Mechanism"
+        data = {
+            "X wins": [
+                r"$p$",
+                r"$-d$" if not attack_mode else r"$p+\varepsilon$"],
+            "Y wins": [
+                r"$-d$",
+                r"$p$"
+            ]
+        }
+        variables = [
+            "- **$p$**: Base reward",
+            "- **$d$**: Deposit amount",
         ]
-    }
-    variables = [
-        "- **$p$**: Base reward",
-        "- **$d$**: Deposit amount",
-    ]
-    if attack_mode:
-        variables.append(r"- **$\varepsilon$**: Bribe amount")
-
-elif payoff_mode == "Redistributive":
-    st.markdown("#### Redistributive Mechanism" + (" with Attack" if attack_mode else ""))
-    data = {
-        "X wins": [
-            r"$\frac{(M - x - 1)d + Mp}{x + 1}$",
-            r"$-d$" if not attack_mode else r"$\frac{(M - x - 1)d + Mp}{x + 1} + \varepsilon$"],
-        "Y wins": [
-            r"$-d$",
-            r"$\frac{xd + Mp}{M - x}$"
+        if attack_mode:
+            variables.append(r"- **$\varepsilon$**: Bribe amount")
+
+    elif payoff_mode == "Redistributive":
+        title = "Redistributive Mechanism"
+        data = {
+            "X wins": [
+                r"$\frac{(M - x - 1)d + Mp}{x + 1}$",
+                r"$-d$" if not attack_mode else r"$\frac{(M - x - 1)d + Mp}{x + 1} + \varepsilon$"],
+            "Y wins": [
+                r"$-d$",
+                r"$\frac{xd + Mp}{M - x}$"
+            ]
+        }
+        variables = [
+            "- **$p$**: Base reward multiplier",
+            "- **$d$**: Deposit amount",
+            "- **$x$**: Number of jurors who voted for X (other than user)",
+            "- **$M$**: Total number of jurors",
         ]
-    }
-    variables = [
-        "- **$p$**: Base reward multiplier",
-        "- **$d$**: Deposit amount",
-        "- **$x$**: Number of jurors who voted for X (other than user)",
-        "- **$M$**: Total number of jurors",
-    ]
-    if attack_mode:
-        variables.append(r"- **$\varepsilon$**: Bribe amount")
-
-elif payoff_mode == "Symbiotic":
-    st.markdown("#### Symbiotic Mechanism" + (" with Attack" if attack_mode else ""))
-    data = {
-        "X wins": [
-            r"$\frac{p(x + 1)}{M}$", 
-            r"$-d$" if not attack_mode else r"$\frac{p(x + 1)}{M} + \varepsilon$"],
-        "Y wins": [
-            r"$-d$",
-            r"$\frac{p(M - x)}{M}$"
+        if attack_mode:
+            variables.append(r"- **$\varepsilon$**: Bribe amount")
+
+    elif payoff_mode == "Symbiotic":
+        title = "Symbiotic Mechanism"
+        data = {
+            "X wins": [
+                r"$\frac{p(x + 1)}{M}$", 
+                r"$-d$" if not attack_mode else r"$\frac{p(x + 1)}{M} + \varepsilon$"],
+            "Y wins": [
+                r"$-d$",
+                r"$\frac{p(M - x)}{M}$"
+            ]
+        }
+        variables = [
+            "- **$p$**: Base reward multiplier",
+            "- **$d$**: Deposit amount",
+            "- **$x$**: Number of jurors who voted for X (other than user)",
+            "- **$M$**: Total number of jurors",
         ]
-    }
-    variables = [
-        "- **$p$**: Base reward multiplier",
-        "- **$d$**: Deposit amount",
-        "- **$x$**: Number of jurors who voted for X (other than user)",
-        "- **$M$**: Total number of jurors",
+        if attack_mode:
+            variables.append(r"- **$\varepsilon$**: Bribe amount")
+
+    title += " with Attack" if attack_mode else ""
+
+    rows = [
+        f"#### {title}",
+        "",
+        "| | X wins | Y wins |",
+        "|---|---|---|",
+        f"| **User votes X** | {data['X wins'][0]} | {data['Y wins'][0]} |",
+        f"| **User votes Y** | {data['X wins'][1]} | {data['Y wins'][1]} |",
+        "",
+        "### Variables",
+        "",
     ]
-    if attack_mode:
-        variables.append(r"- **$\varepsilon$**: Bribe amount")
+    return "\n".join(rows + variables)
 
 # Display the table and variable explanations
-
-df_details = pd.DataFrame(data, index=["User votes X", "User votes Y"])
-st.table(df_details)
-
-st.markdown("### Variables")
-for var in variables:
-    st.markdown(var)
+st.markdown(_payoff_matrix_md(payoff_mode, attack_mode))
 
 # st.markdown("---") - adds a line to seperate parts cleanly
 st.markdown("### Expected vs Actual Numeric Payoff Matrix")
@@ -377,135 +500,100 @@ if num_rounds == 1:
     outcome = "X" if outcome_counts["X"] == 1 else "Y"
     votes_for_X = int(results.get("average_votes_X", 0))
     votes_for_Y = int(results.get("average_votes_Y", 0))
-    st.write(f"Outcome of this round: **{outcome}**")
-    st.write(f"Votes — X: {votes_for_X}, Y: {votes_for_Y}")
+    lines = [
+        f"Outcome of this round: **{outcome}**",
+        f"Votes — X: {votes_for_X}, Y: {votes_for_Y}",
+    ]
     if "Tie" in df.columns:
-        st.write(f"The result was a tie")
+        lines.append(f"The result was a tie")
     if attack_mode:
         if outcome == "Y":
-            st.write("Attack Outcome: **Succeeded** (Target outcome Y achieved)")
+            lines.append("Attack Outcome: **Succeeded** (Target outcome Y achieved)")
         else:
-            st.write("Attack Outcome: **Failed** (Target outcome Y not achieved)")
+            lines.append("Attack Outcome: **Failed** (Target outcome Y not achieved)")
 else:
     # Multiple rounds: show aggregated statistics
     total_runs = num_rounds 
-    wins_X = (df["Majority"] == "X").sum()
-    wins_Y = (df["Majority"] == "Y").sum()
-    wins_Tie = (df["Majority"] == "Tie").sum()
+    wins_X = (~tie_mask & ~y_wins).sum()
+    wins_Y = y_wins.sum()
+    wins_Tie = tie_mask.sum()
     pct_X = (wins_X / total_runs) * 100
     pct_Y = (wins_Y / total_runs) * 100
     pct_Tie = (wins_Tie / total_runs) * 100
-    st.write(f"Out of **{total_runs}** simulation rounds:")
-    st.write(f"- Outcome **X** won **{wins_X}** times ({pct_X:.1f}%)")
-    st.write(f"- Outcome **Y** won **{wins_Y}** times ({pct_Y:.1f}%)")
+    lines = [
+        f"Out of **{total_runs}** simulation rounds:",
+        f"- Outcome **X** won **{wins_X}** times ({pct_X:.1f}%)",
+        f"- Outcome **Y** won **{wins_Y}** times ({pct_Y:.1f}%)",
+    ]
     if "Tie" in df.columns:
-        st.write(f"- Number of **tie rounds**: {wins_Tie} ({pct_Tie:.1f}%)")
+        lines.append(f"- Number of **tie rounds**: {wins_Tie} ({pct_Tie:.1f}%)")
     if attack_mode:
         success_rate = results.get("attack_success_rate", 0)
-        st.write(f"Attack Success Rate (Rate of Y wins as compared to no attack): **{success_rate:.1f}%**")
+        lines.append(f"Attack Success Rate (Rate of Y wins as compared to no attack): **{success_rate:.1f}%**")
     avg_X = results.get("average_votes_X", None)
     avg_Y = results.get("average_votes_Y", None)
     
     if avg_X is not None and avg_Y is not None:
-        st.write(f"Average votes per round — X: **{avg_X:.2f}**, Y: **{avg_Y:.2f}**")
+        lines.append(f"Average votes per round — X: **{avg_X:.2f}**, Y: **{avg_Y:.2f}**")
+
+# one markdown element for the whole summary instead of one per line
+st.markdown("\n\n".join(lines))
 
 # Line chart of vote counts across rounds (only shown if multiple rounds)
 if len(df) > 1:
     st.subheader("Voting Dynamics Across Rounds")
 
-    df_long = df.copy()
+    df_long = df if votes_rows is None else df.iloc[votes_rows]
 
     # Create long-format data with Tie markers included
-    melted = df_long.melt(id_vars=[index_label], value_vars=["X_votes", "Y_votes"],
+    melted = df_long.melt(id_vars=[INDEX_LABEL], value_vars=["X_votes", "Y_votes"],
                           var_name="Vote Type", value_name="Count")
 
     # Add Tie points as a separate category
+    # (taken from the full frame, so no tie is lost to the downsampling)
     if "Tie" in df.columns and df["Tie"].sum() > 0:
         tie_df = df[df["Tie"] == 1].copy()
         tie_df["Vote Type"] = "Tie"
         tie_df["Count"] = tie_df["X_votes"]  # or Y_votes (they are equal in tie)
-        tie_df = tie_df[[index_label, "Vote Type", "Count"]]
+        tie_df = tie_df[[INDEX_LABEL, "Vote Type", "Count"]]
         melted = pd.concat([melted, tie_df], ignore_index=True)
 
-    # Plot line chart for X and Y votes
-    base_chart = alt.Chart(melted[melted["Vote Type"] != "Tie"]).mark_line().encode(
-        x=alt.X(f"{index_label}:Q", title=index_label),
-        y=alt.Y("Count:Q", title="Number of Votes"),
-        color=alt.Color("Vote Type:N", title="Vote Option",
-            scale=alt.Scale(domain=["X_votes", "Y_votes", "Tie"],
-                            range=["steelblue", "red", "gold"]),
-            legend=alt.Legend(labelExpr="""{
-                'X_votes': 'Votes for X',
-                'Y_votes': 'Votes for Y',
-                'Tie': 'Tied Votes'
-            }[datum.label]"""))
-    ).properties(
-        width=800,
-        height=400,
-    )
-
-    # Add dots for ties
-    tie_dots = alt.Chart(melted[melted["Vote Type"] == "Tie"]).mark_point(
-        size=80,
-        shape="circle"
-    ).encode(
-        x=alt.X(f"{index_label}:Q"),
-        y=alt.Y("Count:Q"),
-        color=alt.Color("Vote Type:N", scale=alt.Scale(domain=["Tie"], range=["gold"]))
-    )
-
-    st.altair_chart(base_chart + tie_dots, use_container_width=False)
+    # Plot line chart for X and Y votes, with dots for ties
+    st.vega_lite_chart(melted, VOTES_SPEC, use_container_width=False)
 
 # Average payoff
 
 # Nullify payoff where tie occurs
 df.loc[df["Tie"] == 1, ["avg_payoff_X", "avg_payoff_Y"]] = None
 
-# Tie lines (dashed vertical rules where tie == 1)
-tie_df = df[df["Tie"] == 1][[index_label]].copy()
-tie_df["Vote Type"] = "Tie round"
-tie_df["Average Payoff"] = 0  # Dummy value for y-axis binding
-
-tie_lines = alt.Chart(tie_df).mark_rule(
-    strokeDash=[4, 4],
-    stroke="gold",
-    strokeWidth=2
-).encode(
-    x=alt.X(f"{index_label}:Q"),
-    color=alt.Color("Vote Type:N",
-        scale=alt.Scale(domain=["avg_payoff_X", "avg_payoff_Y", "Tie round"],
-                        range=["steelblue", "red", "gold"]),
-        legend=alt.Legend(title="Vote Option",
-            labelExpr="""{'avg_payoff_X': 'Payoff for voting X',
-                          'avg_payoff_Y': 'Payoff for voting Y',
-                          'Tie round': 'Tie round'}[datum.label]""")
-    )
-)
-
-# Base payoff lines (as before)
-base_payoff = alt.Chart(df).transform_fold(
-    ["avg_payoff_X", "avg_payoff_Y"],
-    as_=["Vote Type", "Average Payoff"]
-).mark_line().encode(
-    x=alt.X(f"{index_label}:Q", title=index_label),
-    y=alt.Y("Average Payoff:Q", title="Payoff"),
-    color=alt.Color("Vote Type:N",
-        scale=alt.Scale(domain=["avg_payoff_X", "avg_payoff_Y", "Tie round"],
-                        range=["steelblue", "red", "gold"]),
-        legend=alt.Legend(title="Vote Option",
-            labelExpr="""{'avg_payoff_X': 'Payoff for voting X',
-                          'avg_payoff_Y': 'Payoff for voting Y',
-                          'Tie round': 'Tie round'}[datum.label]""")
-    )
-).properties(width=800, height=400)
+# long-format payoffs plus one row per tie round, melted here rather than folded in the browser
+df_payoff = df if payoff_rows is None else df.iloc[payoff_rows]
+payoff_long = df_payoff.melt(id_vars=[INDEX_LABEL], value_vars=["avg_payoff_X", "avg_payoff_Y"],
+                             var_name="Vote Type", value_name="Average Payoff")
+tie_rounds = df.loc[df["Tie"] == 1, [INDEX_LABEL]].assign(**{"Vote Type": "Tie round"})
+payoff_long = pd.concat([payoff_long, tie_rounds], ignore_index=True)
 
 # Combine and render
-st.altair_chart(base_payoff + tie_lines, use_container_width=False)
+st.vega_lite_chart(payoff_long, PAYOFF_SPEC, use_container_width=False)
 
 
 # CSV download for all results (voting dynamics and average payoff)
 
-csv_data = df.to_csv(index=False).encode("utf-8")
+# streamlit hashes the frame by content, so reruns with unchanged results skip the encoding
+# (including deriving the Majority/AttackSucceeded columns, which only the CSV uses)
+@st.cache_data(show_spinner=False, max_entries=SIM_CACHE_SIZE)
+def _encode_csv(df: pd.DataFrame, attack_mode: bool) -> bytes:
+    votes_X = df["X_votes"].to_numpy()
+    votes_Y = df["Y_votes"].to_numpy()
+    y_wins = votes_Y > votes_X
+
+    # determine the majority and whether attack succeeded
+    out = df.assign(AttackSucceeded=y_wins.astype(np.int8) if attack_mode else 0)
+    out.insert(out.columns.get_loc("Tie"), "Majority",
+               np.where(votes_X == votes_Y, "Tie", np.where(y_wins, "Y", "X")))
+    return out.to_csv(index=False).encode("utf-8")
+
+csv_data = _encode_csv(df, attack_mode)
 st.download_button(
     label="Download Simulation Results as a CSV file",
     data=csv_data,